@@ -0,0 +1,47 @@
+/**
+ * Minimal leveled logger.
+ * Per-page progress is logged at debug level, which is off unless
+ * LOG_LEVEL=debug, so long extractions don't format and write every page.
+ * Messages may be functions, which are only called when the level is enabled.
+ */
+
+const LEVELS = { debug: 10, info: 20, warn: 30, error: 40 };
+
+class Logger {
+    constructor(level = 'info') {
+        this.setLevel(level);
+    }
+
+    setLevel(level) {
+        this.level = LEVELS[level] ?? LEVELS.info;
+    }
+
+    isEnabled(level) {
+        return LEVELS[level] >= this.level;
+    }
+
+    log(level, message) {
+        if (!this.isEnabled(level)) return;
+        console.log(typeof message === 'function' ? message() : message);
+    }
+
+    debug(message) {
+        this.log('debug', message);
+    }
+
+    info(message) {
+        this.log('info', message);
+    }
+
+    warn(message) {
+        this.log('warn', message);
+    }
+
+    error(message) {
+        this.log('error', message);
+    }
+}
+
+const logger = new Logger(process.env.LOG_LEVEL);
+
+export default logger;
@@ -0,0 +1,37 @@
+/**
+ * Small in-process LRU cache built on Map's insertion order.
+ * Used to avoid spending rate-limit budget on lookups already made in this run.
+ */
+
+class LruCache {
+    constructor(maxSize = 4096) {
+        this.maxSize = maxSize;
+        this.entries = new Map();
+    }
+
+    get(key) {
+        if (!this.entries.has(key)) return undefined;
+
+        // Re-insert to mark as most recently used
+        const value = this.entries.get(key);
+        this.entries.delete(key);
+        this.entries.set(key, value);
+        return value;
+    }
+
+    set(key, value) {
+        this.entries.delete(key);
+        this.entries.set(key, value);
+
+        if (this.entries.size > this.maxSize) {
+            // First key is the least recently used
+            this.entries.delete(this.entries.keys().next().value);
+        }
+    }
+
+    delete(key) {
+        this.entries.delete(key);
+    }
+}
+
+export default LruCache;
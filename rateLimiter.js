@@ -0,0 +1,74 @@
+/**
+ * Per-endpoint rate limiter driven by Twitter's rate-limit response headers.
+ * Instead of a fixed delay, the remaining requests of the current window
+ * (x-rate-limit-remaining) are spread evenly until it resets (x-rate-limit-reset).
+ * Repeated 429s back off exponentially (1s, 2s, 4s, ...) on top of that, so a
+ * response without a usable reset header never causes a tight retry loop.
+ */
+
+import logger from './logger.js';
+
+const DEFAULT_WINDOW_SECONDS = 15 * 60;
+const BACKOFF_BASE_MS = 1000;
+
+export function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+class RateLimiter {
+    constructor(name) {
+        this.name = name;
+        this.remaining = null; // Unknown until the first response
+        this.reset = null;     // Window reset time (epoch seconds)
+        this.backoffUntil = 0; // Earliest retry after a 429 (epoch ms)
+        this.consecutiveLimited = 0;
+    }
+
+    update(rateLimit) {
+        if (!rateLimit) return;
+        this.remaining = rateLimit.remaining;
+        this.reset = rateLimit.reset;
+        this.consecutiveLimited = 0;
+    }
+
+    // Called on HTTP 429: nothing left until the window resets, and back off
+    // exponentially in case the reset header is missing or already past
+    exhaust(rateLimit) {
+        this.remaining = 0;
+        this.reset = rateLimit?.reset || null;
+
+        const backoffMs = Math.min(
+            BACKOFF_BASE_MS * 2 ** this.consecutiveLimited,
+            DEFAULT_WINDOW_SECONDS * 1000
+        );
+        this.backoffUntil = Date.now() + backoffMs;
+        this.consecutiveLimited++;
+    }
+
+    delayMs() {
+        const now = Date.now();
+        const backoff = Math.max(0, this.backoffUntil - now);
+        if (this.remaining === null || this.reset === null) return backoff;
+
+        const untilReset = this.reset * 1000 - now;
+        if (untilReset <= 0) return backoff;
+        return Math.max(backoff, Math.ceil(untilReset / Math.max(1, this.remaining)));
+    }
+
+    async acquire() {
+        const waitMs = this.delayMs();
+        if (waitMs > 0) {
+            // Pacing waits happen before nearly every request, so they're debug-only
+            logger.debug(() => `   ⏳ [${this.name}] ${this.remaining} requests left in window, waiting ${Math.ceil(waitMs / 1000)} seconds...`);
+            await sleep(waitMs);
+        }
+
+        // Reserve a request so concurrent callers see the reduced quota;
+        // the next response's headers overwrite this with the real value
+        if (this.remaining !== null) {
+            this.remaining = Math.max(0, this.remaining - 1);
+        }
+    }
+}
+
+export default RateLimiter;
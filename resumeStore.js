@@ -0,0 +1,80 @@
+/**
+ * Disk-backed page log for resuming interrupted extractions.
+ * Every fetched page body is appended as one JSON line to
+ * ~/.twitter_extractor/<tweetId>-<endpoint>.jsonl. On resume the saved pages
+ * are replayed and fetching continues from the last page's next_token.
+ * Logs are removed once a run completes, so only interrupted runs resume.
+ */
+
+import { appendFileSync, existsSync, mkdirSync, readFileSync, rmSync, statSync, truncateSync, writeFileSync } from 'fs';
+import { homedir } from 'os';
+import { join } from 'path';
+import logger from './logger.js';
+
+const DEFAULT_DIR = join(homedir(), '.twitter_extractor');
+
+class ResumeStore {
+    constructor(tweetId, endpoint, options = {}) {
+        const { dir = DEFAULT_DIR, resume = false } = options;
+
+        mkdirSync(dir, { recursive: true });
+        this.path = join(dir, `${tweetId}-${endpoint}.jsonl`);
+
+        // With --resume, cut the log after the last page that parsed so new
+        // pages append cleanly; the saved pages are not serialized again.
+        // Without it, this run starts a fresh log
+        this.savedPages = [];
+        this.validBytes = 0;
+        this.replaceOnAppend = false;
+        if (resume) {
+            this.savedPages = this.load();
+            if (existsSync(this.path)) {
+                truncateSync(this.path, this.validBytes);
+                return;
+            }
+        } else if (existsSync(this.path) && statSync(this.path).size > 0) {
+            // Pages from an interrupted run: keep them until this run has a
+            // page of its own, so a forgotten --resume doesn't lose them
+            logger.warn(`   💡 Found saved pages from an interrupted run (${endpoint}) - re-run with --resume to continue from them`);
+            this.replaceOnAppend = true;
+            return;
+        }
+        writeFileSync(this.path, '');
+    }
+
+    /**
+     * Saved page bodies, in fetch order. A line cut off by a crash is ignored.
+     */
+    load() {
+        this.validBytes = 0;
+        if (!existsSync(this.path)) return [];
+
+        const pages = [];
+        const lines = readFileSync(this.path, 'utf8').split('\n');
+        // The last element is whatever follows the final newline
+        for (const line of lines.slice(0, -1)) {
+            try {
+                pages.push(JSON.parse(line));
+            } catch (error) {
+                break;
+            }
+            this.validBytes += Buffer.byteLength(line) + 1;
+        }
+        return pages;
+    }
+
+    append(page) {
+        if (this.replaceOnAppend) {
+            this.replaceOnAppend = false;
+            writeFileSync(this.path, JSON.stringify(page) + '\n');
+            return;
+        }
+        appendFileSync(this.path, JSON.stringify(page) + '\n');
+    }
+
+    remove() {
+        rmSync(this.path, { force: true });
+    }
+}
+
+export default ResumeStore;
@@ -0,0 +1,14 @@
+/**
+ * Tweet ID parsing shared by the extractor and the scraper.
+ */
+
+// A .../status/<id> (or legacy .../statuses/<id>) URL, or a bare ID
+const TWEET_ID_RE = /status(?:es)?\/(\d+)|^(\d{6,25})$/;
+
+/**
+ * Tweet ID from a tweet URL or a bare ID; other input is returned unchanged.
+ */
+export function extractTweetId(url) {
+    const match = TWEET_ID_RE.exec(url);
+    return match ? match[1] || match[2] : url;
+}
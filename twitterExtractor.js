@@ -9,8 +9,15 @@ import ExcelJS from 'exceljs';
 import dotenv from 'dotenv';
 import { fileURLToPath } from 'url';
 import { dirname, join } from 'path';
-import { writeFileSync } from 'fs';
 import { createInterface } from 'readline';
+import { copyFile, rename, unlink } from 'fs/promises';
+import { tmpdir } from 'os';
+import { Agent } from 'https';
+import RateLimiter, { sleep } from './rateLimiter.js';
+import LruCache from './lruCache.js';
+import logger from './logger.js';
+import ResumeStore from './resumeStore.js';
+import { extractTweetId } from './tweetId.js';
 
 // Load .env file
 dotenv.config();
@@ -18,6 +25,128 @@ dotenv.config();
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
+// Transient failures worth retrying, with exponential backoff (2s, 4s, 8s)
+const RETRY_STATUS_CODES = [500, 502, 503, 504];
+const MAX_RETRIES = 3;
+const RETRY_BACKOFF_MS = 2000;
+
+// Per-page output is debug-only; show a progress line every N pages instead
+const PROGRESS_EVERY_PAGES = 10;
+
+// GET /2/users accepts at most 100 IDs per request; batches run 5 at a time
+const USERS_LOOKUP_BATCH_SIZE = 100;
+const USERS_LOOKUP_CONCURRENCY = 5;
+
+// Sheet layouts; replies carry extra columns
+const USER_COLUMNS = [
+    { header: 'Username', key: 'username', width: 20 },
+    { header: 'Name', key: 'name', width: 30 },
+    { header: 'User ID', key: 'user_id', width: 20 },
+    { header: 'Interaction Type', key: 'interaction_type', width: 15 }
+];
+const REPLY_COLUMNS = [
+    ...USER_COLUMNS,
+    { header: 'Reply Text', key: 'reply_text', width: 50 },
+    { header: 'Reply Tweet ID', key: 'reply_tweet_id', width: 20 },
+    { header: 'Created At', key: 'created_at', width: 20 }
+];
+
+// Deflate level for the XLSX archive. Compressing the sheet XML is most of
+// the cost of writing it; level 1 is several times faster than the default
+// for plain text cells at a slightly larger file
+const XLSX_COMPRESSION_LEVEL = 1;
+
+// Fields requested from the API - fixed schema, shared by every page request
+const LIST_USER_FIELDS = ['username', 'name', 'created_at'];
+const REPLY_TWEET_FIELDS = ['author_id', 'created_at', 'text', 'public_metrics', 'in_reply_to_user_id'];
+const REPLY_USER_FIELDS = ['username', 'name'];
+// Every field any caller needs, so one cached lookup serves them all
+const TWEET_INFO_FIELDS = ['author_id', 'created_at', 'public_metrics'];
+const TWEET_INFO_USER_FIELDS = ['username'];
+
+// OAuth 1.0a access tokens are "<user id>-<secret part>"
+const ACCESS_TOKEN_USER_ID_RE = /^(\d+)-/;
+
+// Network failures (no or cut-off response) and 5xx are transient;
+// anything else (401, 403, 404, ...) won't get better by retrying
+function isTransientError(error) {
+    return error.type === 'request' ||
+           error.type === 'partial-response' ||
+           RETRY_STATUS_CODES.includes(error.code);
+}
+
+// Pagination info from a v2 page body; meta is absent on empty pages
+function parseMeta(page) {
+    const meta = page?.meta || {};
+    return {
+        nextToken: meta.next_token || null,
+        resultCount: meta.result_count || 0
+    };
+}
+
+// Run task(item) for every item with at most `limit` in flight
+async function runWithConcurrency(items, limit, task) {
+    let next = 0;
+    const worker = async () => {
+        while (next < items.length) {
+            await task(items[next++]);
+        }
+    };
+    await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+}
+
+// Move a finished file into place. rename() is atomic but can't cross
+// filesystems, so fall back to copying when the temp dir is elsewhere
+async function moveFile(from, to) {
+    try {
+        await rename(from, to);
+    } catch (error) {
+        if (error.code !== 'EXDEV') throw error;
+        await copyFile(from, to);
+        await unlink(from);
+    }
+}
+
+// Hand each page to a sink instead of keeping it; returns the row count
+async function drainPages(pages, onRows) {
+    let count = 0;
+    for await (const page of pages) {
+        onRows(page);
+        count += page.length;
+    }
+    return count;
+}
+
+// One row per replier, further replies appended to its text line by line.
+// Keyed on username, since scraped replies have no user ID
+function foldRepliesByUser(replies) {
+    const repliesByUser = new Map();
+    for (const reply of replies) {
+        const key = reply.username.toLowerCase();
+        const existing = repliesByUser.get(key);
+        if (existing) {
+            existing.reply_text += `\n${reply.reply_text}`;
+        } else {
+            repliesByUser.set(key, { ...reply });
+        }
+    }
+    return [...repliesByUser.values()];
+}
+
+// Cell values in sheet column order (USER_COLUMNS / REPLY_COLUMNS), so rows
+// need no per-row key lookup. IDs stay strings: snowflakes exceed
+// Number.MAX_SAFE_INTEGER and would lose digits as numbers
+function userCells(user, interactionType) {
+    return [user.username, user.name, user.id, interactionType];
+}
+
+function replyCells(reply, interactionType) {
+    return [
+        reply.username, reply.name, reply.user_id, interactionType,
+        reply.reply_text, reply.reply_tweet_id, reply.created_at
+    ];
+}
+
 class TwitterExtractor {
     constructor(options = {}) {
         const {
@@ -25,9 +154,23 @@ class TwitterExtractor {
             apiKey,
             apiSecret,
             accessToken,
-            accessTokenSecret
+            accessTokenSecret,
+            verboseDiagnostics = false,
+            resume = false
         } = options;
 
+        // Continue from the pages saved by an interrupted run
+        this.resume = resume;
+        // Page logs opened so far; removed once the workbook is saved
+        this.openStores = [];
+
+        // Extra lookups that only explain empty results
+        this.verboseDiagnostics = verboseDiagnostics;
+
+        // Keep-alive agent so every request reuses the same TLS connection
+        // instead of paying a new handshake after each rate-limit wait
+        const httpAgent = new Agent({ keepAlive: true, maxSockets: 16, maxFreeSockets: 4 });
+
         // Initialize Twitter API client
         if (apiKey && apiSecret && accessToken && accessTokenSecret) {
             // Full OAuth 1.0a (required for likes endpoint)
@@ -36,225 +179,365 @@ class TwitterExtractor {
                 appSecret: apiSecret,
                 accessToken: accessToken,
                 accessSecret: accessTokenSecret,
-            });
+            }, { httpAgent });
             // Use readWrite for OAuth 1.0a (has access to likes/retweets)
             this.apiClient = this.client.readWrite;
             this.authType = 'oauth1';
         } else if (bearerToken) {
             // Bearer Token (read-only, doesn't work for likes)
-            this.client = new TwitterApi(bearerToken);
+            this.client = new TwitterApi(bearerToken, { httpAgent });
             this.apiClient = this.client.readOnly;
             this.authType = 'bearer';
         } else {
             throw new Error('Need either: bearerToken OR (apiKey + apiSecret + accessToken + accessTokenSecret)');
         }
+
+        // One limiter per endpoint - each has its own rate-limit window
+        this.rateLimiters = {
+            likes: new RateLimiter('likes'),
+            retweets: new RateLimiter('retweets'),
+            search: new RateLimiter('search'),
+            users: new RateLimiter('users')
+        };
+
+        // Lookups cached for the lifetime of this extractor
+        this.tweetCache = new LruCache(4096);
+        this.userCache = new LruCache(4096);
+        this.mePromise = null;
+        // The account's ID is part of the access token, so usually no lookup is needed
+        this.ownUserId = this.authType === 'oauth1'
+            ? ACCESS_TOKEN_USER_ID_RE.exec(accessToken)?.[1] || null
+            : null;
     }
 
     extractTweetId(url) {
-        if (url.includes('/status/')) {
-            return url.split('/status/')[1].split('?')[0];
+        return extractTweetId(url);
+    }
+
+    /**
+     * Walk every page of a twitter-api-v2 paginator, yielding the raw page
+     * bodies. fetchFirstPage(token) must return the paginator for the first
+     * page, starting at `token` when one is given.
+     * Each page request goes through requestPage() for pacing and retries.
+     * Pagination ends as soon as the paginator is done (no next_token): the
+     * API only sends one when more results exist, so no extra request is made.
+     * With a ResumeStore, pages saved by an earlier run are replayed first
+     * and every new page is saved before it is yielded.
+     */
+    async *paginate(fetchFirstPage, limiter, store = null) {
+        let resumeToken = null;
+
+        if (store && store.savedPages.length > 0) {
+            console.log(`   ♻️  [${limiter.name}] Resuming: replaying ${store.savedPages.length} saved pages`);
+            for (const page of store.savedPages) {
+                yield page;
+            }
+            resumeToken = parseMeta(store.savedPages.at(-1)).nextToken;
+            // The earlier run already reached the last page
+            if (!resumeToken) return;
+        }
+
+        let paginator = await this.requestPage(() => fetchFirstPage(resumeToken), limiter);
+
+        while (true) {
+            store?.append(paginator.data);
+            yield paginator.data;
+            if (paginator.done) break;
+
+            // next() returns a paginator holding only the following page
+            const current = paginator;
+            paginator = await this.requestPage(() => current.next(), limiter);
+        }
+    }
+
+    // Page log for one endpoint; extraction still works if it can't be created
+    openStore(tweetId, endpoint) {
+        try {
+            const store = new ResumeStore(tweetId, endpoint, { resume: this.resume });
+            this.openStores.push(store);
+            return store;
+        } catch (error) {
+            console.log(`   ⚠️  Could not open resume log for ${endpoint}: ${error.message}`);
+            return null;
         }
-        return url;
     }
 
-    async sleep(ms) {
-        return new Promise(resolve => setTimeout(resolve, ms));
+    /**
+     * Make one request paced by the endpoint's rate limiter. A 429 parks the
+     * limiter until the window resets (backing off exponentially on repeats)
+     * and the request is retried.
+     * Transient errors are retried up to MAX_RETRIES times with backoff;
+     * everything else is thrown to the caller straight away.
+     */
+    async requestPage(request, limiter) {
+        let retries = 0;
+
+        while (true) {
+            await limiter.acquire();
+
+            try {
+                const paginator = await request();
+                limiter.update(paginator.rateLimit);
+                return paginator;
+            } catch (error) {
+                if (error.code === 429) {
+                    limiter.exhaust(error.rateLimit);
+                    console.log(`   ⚠️  [${limiter.name}] Rate limit hit, backing off until window reset...`);
+                    continue;
+                }
+                if (isTransientError(error) && retries < MAX_RETRIES) {
+                    const waitMs = RETRY_BACKOFF_MS * 2 ** retries;
+                    retries++;
+                    console.log(`   ⚠️  [${limiter.name}] ${error.code ? `Server error ${error.code}` : 'Network error'}, retry ${retries}/${MAX_RETRIES} in ${waitMs / 1000} seconds...`);
+                    logger.debug(() => error.stack);
+                    await sleep(waitMs);
+                    continue;
+                }
+                throw error;
+            }
+        }
     }
 
-    async getLikers(tweetId) {
-        console.log('\n   📥 Fetching ALL likers... (respecting 25 requests/15 mins limit)');
-        console.log('   💡 Using max_results=100 with proper delays to get ALL data...');
+    /**
+     * Yield likers page by page (API user objects), so callers can write
+     * them out as they arrive.
+     */
+    async *iterLikers(tweetId) {
+        console.log('\n   📥 Fetching ALL likers... (pacing by rate-limit headers)');
+        console.log('   💡 Using max_results=100, delays follow the remaining request quota...');
         console.log('   💡 Note: Works best for your OWN tweets (OAuth 1.0a required)');
 
-        const likers = [];
-        let requestCount = 0;
-        let nextToken = null;
         let count = 0;
+        let requestCount = 0;
 
         try {
-            while (true) {
+            const pages = this.paginate(
+                token => this.apiClient.v2.tweetLikedBy(tweetId, {
+                    asPaginator: true,
+                    max_results: 100,
+                    'user.fields': LIST_USER_FIELDS,
+                    ...(token && { pagination_token: token })
+                }),
+                this.rateLimiters.likes,
+                this.openStore(tweetId, 'likes')
+            );
+
+            for await (const page of pages) {
                 requestCount++;
 
-                try {
-                    let response;
-                    if (nextToken) {
-                        console.log(`   📄 Request ${requestCount}: Fetching next page...`);
-                        response = await this.apiClient.v2.tweetLikedBy(tweetId, {
-                            max_results: 100,
-                            pagination_token: nextToken,
-                            'user.fields': ['username', 'name', 'created_at']
-                        });
-                    } else {
-                        response = await this.apiClient.v2.tweetLikedBy(tweetId, {
-                            max_results: 100,
-                            'user.fields': ['username', 'name', 'created_at']
-                        });
+                if (!page.data || page.data.length === 0) {
+                    if (requestCount === 1) {
+                        console.log('   ⚠️  WARNING: Tweet shows likes in metrics, but API returned 0 likers');
+                        console.log('   💡 Possible reasons:');
+                        console.log('      - Likes are from protected accounts (not visible via API)');
+                        console.log('      - API tier has limited visibility (Basic tier limitation)');
+                        console.log('      - Privacy settings hide likers from API access');
+                        console.log('   📊 This is a Twitter API limitation, not a code issue');
                     }
+                    break;
+                }
 
-                    if (response.data && response.data.length > 0) {
-                        for (const user of response.data) {
-                            likers.push({
-                                username: user.username,
-                                name: user.name,
-                                user_id: user.id
-                            });
-                            count++;
-                        }
+                // API user objects are passed through as-is, no per-user copy
+                const users = page.data;
+                count += users.length;
+
+                logger.debug(() => `   ✅ Request ${requestCount}: Fetched ${users.length} users (Total: ${count} likers)`);
+                logger.debug(() => {
+                    const { nextToken } = parseMeta(page);
+                    return nextToken ? `   📄 More data available! next_token = ${nextToken.substring(0, 30)}...` : `   📄 Last page`;
+                });
+                if (requestCount % PROGRESS_EVERY_PAGES === 0) {
+                    logger.info(`   📊 Likers: ${count} so far (${requestCount} requests)...`);
+                }
+                yield users;
+            }
 
-                        console.log(`   ✅ Request ${requestCount}: Fetched ${response.data.length} users (Total: ${count} likers)`);
+            console.log(`   ✅ No more data. Total: ${count} likers`);
+        } catch (error) {
+            if (error.code === 401) {
+                console.log('   ❌ UNAUTHORIZED: This endpoint requires OAuth 1.0a User Context');
+                console.log('   💡 You need: API Key + Secret + Access Token + Access Token Secret');
+            } else if (error.code === 403) {
+                console.log('   ❌ FORBIDDEN: Bearer Token (OAuth 2.0) doesn\'t work for this endpoint!');
+                console.log('   💡 You MUST use OAuth 1.0a User Context');
+            } else {
+                console.log(`   ❌ Error in request ${requestCount + 1}: ${error.message}`);
+            }
+        }
+    }
 
-                        // Check for next page
-                        nextToken = response.meta?.next_token || null;
+    /**
+     * Yield retweeters page by page (API user objects), so callers can write
+     * them out as they arrive.
+     */
+    async *iterRetweeters(tweetId) {
+        console.log('\n   🔄 Fetching ALL retweeters... (pacing by rate-limit headers)');
+        console.log('   💡 Using max_results=100, delays follow the remaining request quota...');
 
-                        if (nextToken) {
-                            console.log(`   📄 More data available! next_token = ${nextToken.substring(0, 30)}...`);
-                        } else {
-                            console.log(`   ✅ No more data. Total: ${count} likers`);
-                            break;
-                        }
-                    } else {
-                        if (requestCount === 1 && count === 0) {
-                            console.log('   ⚠️  WARNING: Tweet shows likes in metrics, but API returned 0 likers');
-                            console.log('   💡 Possible reasons:');
-                            console.log('      - Likes are from protected accounts (not visible via API)');
-                            console.log('      - API tier has limited visibility (Basic tier limitation)');
-                            console.log('      - Privacy settings hide likers from API access');
-                            console.log('   📊 This is a Twitter API limitation, not a code issue');
-                        }
-                        console.log(`   ✅ No more data. Total: ${count} likers`);
-                        break;
-                    }
-                } catch (error) {
-                    if (error.code === 401) {
-                        console.log('   ❌ UNAUTHORIZED: This endpoint requires OAuth 1.0a User Context');
-                        console.log('   💡 You need: API Key + Secret + Access Token + Access Token Secret');
-                    } else if (error.code === 403) {
-                        console.log('   ❌ FORBIDDEN: Bearer Token (OAuth 2.0) doesn\'t work for this endpoint!');
-                        console.log('   💡 You MUST use OAuth 1.0a User Context');
-                    } else {
-                        console.log(`   ❌ Error in request ${requestCount}: ${error.message}`);
-                    }
+        let count = 0;
+        let requestCount = 0;
+
+        try {
+            const pages = this.paginate(
+                token => this.apiClient.v2.tweetRetweetedBy(tweetId, {
+                    asPaginator: true,
+                    max_results: 100,
+                    'user.fields': LIST_USER_FIELDS,
+                    ...(token && { pagination_token: token })
+                }),
+                this.rateLimiters.retweets,
+                this.openStore(tweetId, 'retweets')
+            );
+
+            for await (const page of pages) {
+                requestCount++;
+
+                if (!page.data || page.data.length === 0) {
                     break;
                 }
 
-                // Rate limit handling: 25 requests / 15 mins = 36 seconds per request
-                if (requestCount % 25 === 0) {
-                    const waitTime = 15 * 60;
-                    console.log(`   ⏳ Rate limit window reached (25 requests). Waiting ${waitTime / 60} minutes for reset...`);
-                    await this.sleep(waitTime * 1000);
-                } else {
-                    const waitTime = 40;
-                    console.log(`   ⏳ Waiting ${waitTime} seconds before next request (rate limit: 25/15min)...`);
-                    await this.sleep(waitTime * 1000);
+                // API user objects are passed through as-is, no per-user copy
+                const users = page.data;
+                count += users.length;
+
+                logger.debug(() => `   ✅ Request ${requestCount}: Fetched ${users.length} users (Total: ${count} retweeters)`);
+                logger.debug(() => {
+                    const { nextToken } = parseMeta(page);
+                    return nextToken ? `   📄 More data available! next_token = ${nextToken.substring(0, 30)}...` : `   📄 Last page`;
+                });
+                if (requestCount % PROGRESS_EVERY_PAGES === 0) {
+                    logger.info(`   📊 Retweeters: ${count} so far (${requestCount} requests)...`);
                 }
+                yield users;
             }
+
+            console.log(`   ✅ No more data. Total: ${count} retweeters`);
         } catch (error) {
-            if (error.code === 429) {
-                console.log('   ⚠️  Rate limit hit. Please wait and try again.');
+            if (error.code === 401) {
+                console.log('   ❌ UNAUTHORIZED: This endpoint requires OAuth 1.0a User Context');
+            } else if (error.code === 403) {
+                console.log('   ❌ FORBIDDEN: Bearer Token doesn\'t work for this endpoint!');
             } else {
-                console.log(`   ❌ Error: ${error.message}`);
+                console.log(`   ❌ Error in request ${requestCount + 1}: ${error.message}`);
             }
         }
-
-        return likers;
     }
 
-    async getRetweeters(tweetId) {
-        console.log('\n   🔄 Fetching ALL retweeters... (respecting 25 requests/15 mins limit)');
-        console.log('   💡 Using max_results=100 with proper delays to get ALL data...');
+    /**
+     * Yield reply rows page by page, one row per reply tweet, so callers can
+     * process them as they arrive. Direct replies are searched first, then
+     * the whole conversation. Authors missing from a page's includes are
+     * looked up before the page is yielded; rows whose author can't be
+     * resolved are dropped.
+     */
+    async *iterReplies(tweetId) {
+        const queries = [
+            `in_reply_to_tweet_id:${tweetId}`,
+            `conversation_id:${tweetId}`
+        ];
+
+        let foundReplies = false;
+        let replyCount = 0;
+        const seenTweetIds = new Set();
 
-        const retweeters = [];
-        let requestCount = 0;
-        let nextToken = null;
-        let count = 0;
+        for (const [queryIndex, query] of queries.entries()) {
+            console.log(`   🔍 Trying query: ${query}`);
+            let requestCount = 0;
 
-        try {
-            while (true) {
-                requestCount++;
+            try {
+                const pages = this.paginate(
+                    token => this.apiClient.v2.search(query, {
+                        max_results: 75,
+                        'tweet.fields': REPLY_TWEET_FIELDS,
+                        expansions: ['author_id'],
+                        'user.fields': REPLY_USER_FIELDS,
+                        ...(token && { next_token: token })
+                    }),
+                    this.rateLimiters.search,
+                    this.openStore(tweetId, `replies-${queryIndex}`)
+                );
 
-                try {
-                    let response;
-                    if (nextToken) {
-                        console.log(`   📄 Request ${requestCount}: Fetching next page...`);
-                        response = await this.apiClient.v2.tweetRetweetedBy(tweetId, {
-                            max_results: 100,
-                            pagination_token: nextToken,
-                            'user.fields': ['username', 'name', 'created_at']
-                        });
-                    } else {
-                        response = await this.apiClient.v2.tweetRetweetedBy(tweetId, {
-                            max_results: 100,
-                            'user.fields': ['username', 'name', 'created_at']
-                        });
-                    }
+                for await (const page of pages) {
+                    requestCount++;
 
-                    if (response.data && response.data.length > 0) {
-                        for (const user of response.data) {
-                            retweeters.push({
-                                username: user.username,
-                                name: user.name,
-                                user_id: user.id
-                            });
-                            count++;
+                    if (!page.data || page.data.length === 0) {
+                        if (requestCount === 1) {
+                            // First request returned nothing, try next query
+                            console.log(`   ⚠️  Query returned no results, trying next query...`);
                         }
+                        break;
+                    }
 
-                        console.log(`   ✅ Request ${requestCount}: Fetched ${response.data.length} users (Total: ${count} retweeters)`);
+                    foundReplies = true;
+                    const usersMap = new Map();
+                    for (const user of page.includes?.users || []) {
+                        usersMap.set(user.id, user);
+                        this.userCache.set(user.id, user);
+                    }
 
-                        // Check for next page
-                        nextToken = response.meta?.next_token || null;
+                    // Skip the original tweet itself and tweets already seen
+                    const tweets = page.data.filter(tweet => tweet.id !== tweetId && !seenTweetIds.has(tweet.id));
+                    const missingAuthorIds = new Set();
+                    for (const tweet of tweets) {
+                        seenTweetIds.add(tweet.id);
+                        if (!usersMap.has(tweet.author_id) && !this.userCache.get(tweet.author_id)) {
+                            missingAuthorIds.add(tweet.author_id);
+                        }
+                    }
 
-                        if (nextToken) {
-                            console.log(`   📄 More data available! next_token = ${nextToken.substring(0, 30)}...`);
-                        } else {
-                            console.log(`   ✅ No more data. Total: ${count} retweeters`);
-                            break;
+                    if (missingAuthorIds.size > 0) {
+                        logger.debug(`   🔍 Looking up ${missingAuthorIds.size} authors missing from the search results...`);
+                        for (const [userId, user] of await this.lookupUsers([...missingAuthorIds])) {
+                            usersMap.set(userId, user);
                         }
-                    } else {
-                        console.log(`   ✅ No more data. Total: ${count} retweeters`);
-                        break;
                     }
-                } catch (error) {
-                    if (error.code === 401) {
-                        console.log('   ❌ UNAUTHORIZED: This endpoint requires OAuth 1.0a User Context');
-                    } else if (error.code === 403) {
-                        console.log('   ❌ FORBIDDEN: Bearer Token doesn\'t work for this endpoint!');
-                    } else {
-                        console.log(`   ❌ Error in request ${requestCount}: ${error.message}`);
+
+                    const rows = [];
+                    for (const tweet of tweets) {
+                        const user = usersMap.get(tweet.author_id) || this.userCache.get(tweet.author_id);
+                        if (!user) continue;
+                        rows.push({
+                            username: user.username,
+                            name: user.name,
+                            user_id: tweet.author_id,
+                            reply_text: tweet.text,
+                            reply_tweet_id: tweet.id,
+                            created_at: tweet.created_at
+                        });
                     }
-                    break;
-                }
+                    replyCount += rows.length;
 
-                // Rate limit handling
-                if (requestCount % 25 === 0) {
-                    const waitTime = 15 * 60;
-                    console.log(`   ⏳ Rate limit window reached (25 requests). Waiting ${waitTime / 60} minutes...`);
-                    await this.sleep(waitTime * 1000);
-                } else {
-                    const waitTime = 40;
-                    console.log(`   ⏳ Waiting ${waitTime} seconds before next request...`);
-                    await this.sleep(waitTime * 1000);
+                    logger.debug(() => `   ✅ Request ${requestCount}: Fetched ${page.data.length} tweets (Total: ${replyCount} replies)`);
+                    if (requestCount % PROGRESS_EVERY_PAGES === 0) {
+                        logger.info(`   📊 Replies: ${replyCount} replies so far (${requestCount} requests)...`);
+                    }
+
+                    yield rows;
                 }
+            } catch (error) {
+                console.log(`   ❌ Error in request ${requestCount + 1}: ${error.message}`);
+            }
+
+            if (foundReplies) {
+                console.log(`   ✅ No more data. Total: ${replyCount} replies`);
+                return; // Found replies with this query, no need to try others
             }
-        } catch (error) {
-            console.log(`   ❌ Error: ${error.message}`);
         }
 
-        return retweeters;
+        console.log(`   ⚠️  All query attempts returned no results`);
     }
 
     async getRepliers(tweetId) {
         console.log('\n   💬 Fetching replies...');
         console.log('   ⚠️  Note: Only replies from last 7 days are available via API');
 
-        const repliers = [];
-        let requestCount = 0;
-        let nextToken = null;
+        // One row per reply tweet; collectReplies() folds them per user once
+        // the scraping fallback has merged in its own replies
+        const replies = [];
 
         try {
-            // Check tweet age
-            const tweetInfo = await this.apiClient.v2.singleTweet(tweetId, {
-                'tweet.fields': ['created_at', 'author_id']
-            });
+            // Check tweet age (shared cached lookup) before spending any search requests
+            const tweetInfo = await this.getTweetInfo(tweetId);
 
             if (tweetInfo.data) {
                 const tweetDate = new Date(tweetInfo.data.created_at);
@@ -263,213 +546,158 @@ class TwitterExtractor {
                 if (daysOld > 7) {
                     console.log(`   ⚠️  WARNING: Tweet is ${Math.floor(daysOld)} days old`);
                     console.log('   📊 Twitter API only returns replies from last 7 days');
-                    console.log('   💡 Older replies cannot be retrieved via API');
+                    console.log('   💡 Older replies cannot be retrieved via API - skipping search');
+                    return [];
                 }
-            }
 
-            // Search for replies - try different query formats
-            const queries = [
-                `in_reply_to_tweet_id:${tweetId}`,
-                `conversation_id:${tweetId}`,
-                `-from:${tweetId} conversation_id:${tweetId}`
-            ];
-            
-            let queryIndex = 0;
-            let foundReplies = false;
-            
-            while (queryIndex < queries.length && !foundReplies) {
-                const query = queries[queryIndex];
-                console.log(`   🔍 Trying query: ${query}`);
-                nextToken = null; // Reset pagination for new query
-                requestCount = 0;
-                
-                while (true) {
-                    requestCount++;
-
-                    try {
-                        let response;
-                        const searchOptions = {
-                            max_results: 75,
-                            'tweet.fields': ['author_id', 'created_at', 'text', 'public_metrics', 'in_reply_to_user_id'],
-                            expansions: ['author_id'],
-                            'user.fields': ['username', 'name']
-                        };
-                        
-                        if (nextToken) {
-                            searchOptions.next_token = nextToken;
-                            response = await this.apiClient.v2.search(query, searchOptions);
-                        } else {
-                            response = await this.apiClient.v2.search(query, searchOptions);
-                        }
-
-                        if (response.data && response.data.length > 0) {
-                            foundReplies = true;
-                            const usersMap = {};
-                            if (response.includes?.users) {
-                                for (const user of response.includes.users) {
-                                    usersMap[user.id] = user;
-                                }
-                            }
-
-                            for (const tweet of response.data) {
-                                // Skip the original tweet itself
-                                if (tweet.id === tweetId) continue;
-                                
-                                // Verify it's actually a reply to our tweet
-                                if (tweet.in_reply_to_user_id && tweet.in_reply_to_user_id !== tweetId) {
-                                    // This might be a reply in the conversation but not to our specific tweet
-                                    // Still include it as it's part of the conversation
-                                }
-
-                                const user = usersMap[tweet.author_id];
-                                if (user) {
-                                    repliers.push({
-                                        username: user.username,
-                                        name: user.name,
-                                        user_id: user.id,
-                                        reply_text: tweet.text,
-                                        reply_tweet_id: tweet.id,
-                                        created_at: tweet.created_at
-                                    });
-                                }
-                            }
-
-                            console.log(`   ✅ Request ${requestCount}: Fetched ${response.data.length} tweets (Total: ${repliers.length} replies)`);
-
-                            // Check for next page
-                            nextToken = response.meta?.next_token || null;
-
-                            if (nextToken) {
-                                console.log(`   📄 More data available!`);
-                            } else {
-                                console.log(`   ✅ No more data. Total: ${repliers.length} replies`);
-                                break;
-                            }
-                        } else {
-                            if (requestCount === 1) {
-                                // First request returned nothing, try next query
-                                console.log(`   ⚠️  Query returned no results, trying next query...`);
-                                break;
-                            } else {
-                                console.log(`   ✅ No more data. Total: ${repliers.length} replies`);
-                                break;
-                            }
-                        }
-                    } catch (error) {
-                        console.log(`   ❌ Error in request ${requestCount}: ${error.message}`);
-                        if (requestCount === 1) {
-                            // First request failed, try next query
-                            break;
-                        } else {
-                            break;
-                        }
-                    }
-
-                    // Small delay for replies (less restrictive rate limits)
-                    await this.sleep(2000);
+                if (tweetInfo.data.public_metrics?.reply_count === 0) {
+                    console.log('   💡 Tweet has no replies - skipping search');
+                    return [];
                 }
-                
-                if (foundReplies) {
-                    break; // Found replies with this query, no need to try others
-                }
-                
-                queryIndex++;
             }
-            
-            if (!foundReplies && repliers.length === 0) {
-                console.log(`   ⚠️  All query attempts returned no results`);
+
+            for await (const rows of this.iterReplies(tweetId)) {
+                for (const reply of rows) {
+                    replies.push(reply);
+                }
             }
         } catch (error) {
             console.log(`   ❌ Error: ${error.message}`);
         }
 
-        return repliers;
+        return replies;
     }
 
-    async extract(tweetUrl, options = {}) {
-        const { skipLikes = false, skipRetweets = false, outputFile = null, useScrapingFallback = false } = options;
-        const tweetId = this.extractTweetId(tweetUrl);
-
-        console.log('\n' + '='.repeat(70));
-        console.log('🚀 TWITTER DATA EXTRACTOR (Node.js)');
-        console.log('='.repeat(70));
-        console.log(`\n📌 Tweet ID: ${tweetId}`);
-        console.log('⏳ This may take a while depending on the number of interactions...');
+    /**
+     * Fetch a tweet once per run. The pending promise is cached so concurrent
+     * callers share a single request; failed lookups are not cached.
+     */
+    getTweetInfo(tweetId) {
+        let tweetInfo = this.tweetCache.get(tweetId);
+        if (!tweetInfo) {
+            tweetInfo = this.apiClient.v2.singleTweet(tweetId, {
+                'tweet.fields': TWEET_INFO_FIELDS,
+                expansions: ['author_id'],
+                'user.fields': TWEET_INFO_USER_FIELDS
+            });
+            tweetInfo.catch(() => this.tweetCache.delete(tweetId));
+            this.tweetCache.set(tweetId, tweetInfo);
+        }
+        return tweetInfo;
+    }
 
-        // Check if this is the user's own tweet
+    /**
+     * The tweet's public_metrics (like/retweet/reply counts), or null if the
+     * lookup fails. Endpoints whose count is 0 are not worth a request.
+     */
+    async getPublicMetrics(tweetId) {
         try {
-            const tweetInfo = await this.apiClient.v2.singleTweet(tweetId, {
-                'tweet.fields': ['author_id']
-            });
-            if (tweetInfo.data) {
-                const me = await this.apiClient.v2.me();
-                const isOwnTweet = tweetInfo.data.author_id === me.data.id;
-                if (isOwnTweet) {
-                    console.log('\n✅ This is YOUR OWN tweet - all endpoints will work!');
-                } else {
-                    console.log('\n⚠️  This is ANOTHER USER\'s tweet - likes may return 0 if from protected accounts');
-                }
-            }
+            const tweetInfo = await this.getTweetInfo(tweetId);
+            return tweetInfo.data?.public_metrics || null;
         } catch (error) {
-            // Continue anyway
+            return null;
         }
+    }
 
-        console.log('\n' + '─'.repeat(70));
-        console.log('📊 RATE LIMITS INFO');
-        console.log('─'.repeat(70));
-        console.log('   • Likes:    25 requests / 15 minutes');
-        console.log('   • Retweets: 25 requests / 15 minutes');
-        console.log('   • Each request gets up to 100 users');
-        console.log('\n💡 Strategy: 40 second delays between requests');
-        console.log('✅ The script handles this automatically - just let it run!');
-        console.log('─'.repeat(70));
-
-        // Get all data
-        console.log('\n' + '='.repeat(70));
-        console.log('📥 EXTRACTING DATA...');
-        console.log('='.repeat(70));
+    /**
+     * ID of the authenticated account: read from the access token when
+     * possible, otherwise from a /2/users/me lookup.
+     */
+    async getOwnUserId() {
+        if (this.ownUserId) return this.ownUserId;
+        const me = await this.getMe();
+        return me.data.id;
+    }
 
-        let likers = [];
-        let retweeters = [];
-        let repliers = [];
+    getMe() {
+        if (!this.mePromise) {
+            this.mePromise = this.apiClient.v2.me();
+            this.mePromise.catch(() => { this.mePromise = null; });
+        }
+        return this.mePromise;
+    }
 
-        if (!skipLikes) {
-            console.log('\n[1/3] ❤️  FETCHING LIKERS...');
-            console.log('─'.repeat(70));
-            likers = await this.getLikers(tweetId);
-            if (likers.length > 0) {
-                console.log(`\n✅ SUCCESS: Found ${likers.length} likers`);
+    /**
+     * Resolve user IDs to users, 100 IDs per request (the v2 /users maximum).
+     * Users already seen in this run come from the cache.
+     */
+    async lookupUsers(userIds) {
+        const users = new Map();
+        const uncached = [];
+
+        for (const userId of userIds) {
+            const user = this.userCache.get(userId);
+            if (user) {
+                users.set(userId, user);
             } else {
-                console.log('\n⚠️  No likers found');
+                uncached.push(userId);
             }
-        } else {
-            console.log('\n[1/3] ❤️  SKIPPING LIKES (disabled)');
         }
 
-        if (!skipRetweets) {
-            console.log('\n[2/3] 🔄 FETCHING RETWEETERS...');
-            console.log('─'.repeat(70));
-            retweeters = await this.getRetweeters(tweetId);
-            if (retweeters.length > 0) {
-                console.log(`\n✅ SUCCESS: Found ${retweeters.length} retweeters`);
-            } else {
-                console.log('\n⚠️  No retweeters found');
+        const batches = [];
+        for (let i = 0; i < uncached.length; i += USERS_LOOKUP_BATCH_SIZE) {
+            batches.push(uncached.slice(i, i + USERS_LOOKUP_BATCH_SIZE));
+        }
+
+        // Same pacing and 429/5xx retries as paginated requests, so a rate
+        // limit hit waits for the window instead of dropping the batch
+        const lookupBatch = async batch => {
+            try {
+                const response = await this.requestPage(
+                    () => this.apiClient.v2.get('users', {
+                        ids: batch,
+                        'user.fields': REPLY_USER_FIELDS
+                    }, { fullResponse: true }),
+                    this.rateLimiters.users
+                );
+                for (const user of response.data.data || []) {
+                    users.set(user.id, user);
+                    this.userCache.set(user.id, user);
+                }
+            } catch (error) {
+                console.log(`   ⚠️  Could not look up ${batch.length} users: ${error.message}`);
             }
-        } else {
-            console.log('\n[2/3] 🔄 SKIPPING RETWEETS (disabled)');
+        };
+
+        await runWithConcurrency(batches, USERS_LOOKUP_CONCURRENCY, lookupBatch);
+
+        return users;
+    }
+
+    /**
+     * Diagnostic for an empty likers list: likes are only fully visible on
+     * your own tweets. Only runs when asked for, though it rarely costs more
+     * than the cached tweet lookup.
+     */
+    async explainMissingLikes(tweetId) {
+        try {
+            const tweetInfo = await this.getTweetInfo(tweetId);
+            if (tweetInfo.data) {
+                const ownUserId = await this.getOwnUserId();
+                const isOwnTweet = tweetInfo.data.author_id === ownUserId;
+                if (isOwnTweet) {
+                    console.log('   ✅ This is YOUR OWN tweet - likes should be visible');
+                } else {
+                    const author = tweetInfo.includes?.users?.[0]?.username;
+                    console.log(`   ⚠️  This is ANOTHER USER's tweet${author ? ` (@${author})` : ''} - likes may return 0 if from protected accounts`);
+                }
+            }
+        } catch (error) {
+            // Diagnostics only
         }
+    }
+
+    /**
+     * API replies plus the scraping fallback for tweets the search can't cover.
+     */
+    async collectReplies(tweetUrl, tweetId, useScrapingFallback) {
+        let repliers = await this.getRepliers(tweetId);
 
-        console.log('\n[3/3] 💬 FETCHING REPLIES...');
-        console.log('─'.repeat(70));
-        repliers = await this.getRepliers(tweetId);
-        
         // Check tweet age and reply count for scraping fallback
         let tweetAgeDays = 0;
-        let replyCount = 0;
+        let replyCount = null; // Unknown unless the tweet lookup succeeds
         try {
-            const tweetInfo = await this.apiClient.v2.singleTweet(tweetId, {
-                'tweet.fields': ['created_at', 'public_metrics']
-            });
+            const tweetInfo = await this.getTweetInfo(tweetId);
             if (tweetInfo.data) {
                 if (tweetInfo.data.created_at) {
                     const tweetDate = new Date(tweetInfo.data.created_at);
@@ -492,7 +720,8 @@ class TwitterExtractor {
         // 1. Tweet is older than 7 days (API won't work for old tweets) - ALWAYS scrape
         // 2. OR useScrapingFallback flag is set (manual override with --scrape)
         // For tweets < 7 days: API should work, so don't auto-scrape (only if --scrape flag is set)
-        const shouldAutoScrape = tweetAgeDays > 7;
+        // Tweets whose metrics show no replies at all are never auto-scraped
+        const shouldAutoScrape = tweetAgeDays > 7 && replyCount !== 0;
         const shouldScrape = useScrapingFallback || shouldAutoScrape;
         
         // Log decision
@@ -551,8 +780,13 @@ class TwitterExtractor {
             console.log('      node twitterExtractor.js "URL" --scrape');
         }
         
-        if (repliers.length > 0) {
-            console.log(`\n✅ SUCCESS: Found ${repliers.length} replies`);
+        // Fold only now, so the scraper's duplicate check saw every reply's
+        // own tweet ID and text
+        const foundCount = repliers.length;
+        repliers = foldRepliesByUser(repliers);
+
+        if (foundCount > 0) {
+            console.log(`\n✅ SUCCESS: Found ${foundCount} replies from ${repliers.length} users`);
         } else {
             console.log('\n⚠️  No replies found');
             if (replyCount > 0) {
@@ -561,85 +795,164 @@ class TwitterExtractor {
             }
         }
 
-        // Add interaction type
-        likers = likers.map(u => ({ ...u, interaction_type: 'Like' }));
-        retweeters = retweeters.map(u => ({ ...u, interaction_type: 'Retweet' }));
-        repliers = repliers.map(u => ({ ...u, interaction_type: 'Reply' }));
-
-        // Create Excel file
-        const workbook = new ExcelJS.Workbook();
+        return repliers;
+    }
 
-        // All Interactions sheet
+    /**
+     * Fetch every interaction and stream it into a new workbook at `path`.
+     */
+    async writeWorkbook(path, tweetUrl, tweetId, options = {}) {
+        const { skipLikes = false, skipRetweets = false, useScrapingFallback = false } = options;
+
+        // Stream rows into the file as pages arrive instead of holding every
+        // user in memory until the end. Shared strings and styles are off:
+        // both are tables kept in memory until commit, and no cell is styled
+        const workbook = new ExcelJS.stream.xlsx.WorkbookWriter({
+            filename: path,
+            useSharedStrings: false,
+            useStyles: false,
+            zip: { zlib: { level: XLSX_COMPRESSION_LEVEL } }
+        });
         const allSheet = workbook.addWorksheet('All Interactions');
-        const allData = [...likers, ...retweeters, ...repliers];
-        
-        if (allData.length > 0) {
-            const columns = [
-                { header: 'Username', key: 'username', width: 20 },
-                { header: 'Name', key: 'name', width: 30 },
-                { header: 'User ID', key: 'user_id', width: 20 },
-                { header: 'Interaction Type', key: 'interaction_type', width: 15 }
-            ];
-            
-            // Add reply-specific columns if there are replies
-            if (repliers.length > 0) {
-                columns.push(
-                    { header: 'Reply Text', key: 'reply_text', width: 50 },
-                    { header: 'Reply Tweet ID', key: 'reply_tweet_id', width: 20 },
-                    { header: 'Created At', key: 'created_at', width: 20 }
-                );
+        allSheet.columns = REPLY_COLUMNS;
+        // The archive is written one sheet at a time, in the order sheets
+        // first get a row; later sheets are buffered until earlier ones are
+        // committed. Open the All sheet first so the largest sheet streams
+        // straight to disk and only the per-type sheets are held back
+        allSheet.getRow(1).commit();
+        const likesSheet = workbook.addWorksheet('Likes');
+        likesSheet.columns = USER_COLUMNS;
+        const retweetsSheet = workbook.addWorksheet('Retweets');
+        retweetsSheet.columns = USER_COLUMNS;
+        const repliesSheet = workbook.addWorksheet('Replies');
+        repliesSheet.columns = REPLY_COLUMNS;
+
+        // Rows go in as plain cell arrays, built once and shared by both sheets.
+        // The All sheet is the union of the three: like/retweet rows are just
+        // shorter, so the reply columns stay empty cells rather than padding.
+        // Each user appears once in the All sheet (first interaction seen);
+        // the per-type sheets keep every user that interacted that way.
+        // Keyed on username, since scraped replies have no user ID
+        const seenUsers = new Set();
+        const writeRows = (sheet, toCells, interactionType) => rows => {
+            for (const row of rows) {
+                const cells = toCells(row, interactionType);
+                sheet.addRow(cells).commit();
+
+                const userKey = cells[0].toLowerCase();
+                if (!seenUsers.has(userKey)) {
+                    seenUsers.add(userKey);
+                    allSheet.addRow(cells).commit();
+                }
+            }
+        };
+
+        // Endpoints the tweet's metrics show as empty are skipped outright;
+        // the lookup is cached, so the reply checks reuse it
+        const metrics = await this.getPublicMetrics(tweetId);
+        const noLikes = !skipLikes && metrics?.like_count === 0;
+        const noRetweets = !skipRetweets && metrics?.retweet_count === 0;
+
+        if (skipLikes || noLikes) {
+            console.log(`\n[1/3] ❤️  SKIPPING LIKES (${skipLikes ? 'disabled' : 'tweet has 0 likes'})`);
+        } else {
+            console.log('\n[1/3] ❤️  FETCHING LIKERS...');
+        }
+        if (skipRetweets || noRetweets) {
+            console.log(`[2/3] 🔄 SKIPPING RETWEETS (${skipRetweets ? 'disabled' : 'tweet has 0 retweets'})`);
+        } else {
+            console.log('[2/3] 🔄 FETCHING RETWEETERS...');
+        }
+        console.log('[3/3] 💬 FETCHING REPLIES...');
+        console.log('💡 All endpoints run in parallel - their waits overlap');
+        console.log('─'.repeat(70));
+
+        // Replies are kept in memory: the scraping fallback merges into them.
+        // The browser fallback runs while likes/retweets are still paginating
+        const [likeCount, retweetCount, repliers] = await Promise.all([
+            skipLikes || noLikes ? 0 : drainPages(this.iterLikers(tweetId), writeRows(likesSheet, userCells, 'Like')),
+            skipRetweets || noRetweets ? 0 : drainPages(this.iterRetweeters(tweetId), writeRows(retweetsSheet, userCells, 'Retweet')),
+            this.collectReplies(tweetUrl, tweetId, useScrapingFallback)
+        ]);
+
+        // Endpoints skipped for a zero metric already said so above
+        if (!skipLikes && !noLikes) {
+            if (likeCount > 0) {
+                console.log(`\n✅ SUCCESS: Found ${likeCount} likers`);
+            } else {
+                console.log('\n⚠️  No likers found');
+                if (this.verboseDiagnostics) {
+                    await this.explainMissingLikes(tweetId);
+                }
+            }
+        }
+
+        if (!skipRetweets && !noRetweets) {
+            if (retweetCount > 0) {
+                console.log(`\n✅ SUCCESS: Found ${retweetCount} retweeters`);
+            } else {
+                console.log('\n⚠️  No retweeters found');
             }
-            
-            allSheet.columns = columns;
-            allSheet.addRows(allData);
-        }
-
-        // Likes sheet
-        if (likers.length > 0) {
-            const likesSheet = workbook.addWorksheet('Likes');
-            likesSheet.columns = [
-                { header: 'Username', key: 'username', width: 20 },
-                { header: 'Name', key: 'name', width: 30 },
-                { header: 'User ID', key: 'user_id', width: 20 },
-                { header: 'Interaction Type', key: 'interaction_type', width: 15 }
-            ];
-            likesSheet.addRows(likers);
-        }
-
-        // Retweets sheet
-        if (retweeters.length > 0) {
-            const retweetsSheet = workbook.addWorksheet('Retweets');
-            retweetsSheet.columns = [
-                { header: 'Username', key: 'username', width: 20 },
-                { header: 'Name', key: 'name', width: 30 },
-                { header: 'User ID', key: 'user_id', width: 20 },
-                { header: 'Interaction Type', key: 'interaction_type', width: 15 }
-            ];
-            retweetsSheet.addRows(retweeters);
-        }
-
-        // Replies sheet
-        if (repliers.length > 0) {
-            const repliesSheet = workbook.addWorksheet('Replies');
-            repliesSheet.columns = [
-                { header: 'Username', key: 'username', width: 20 },
-                { header: 'Name', key: 'name', width: 30 },
-                { header: 'User ID', key: 'user_id', width: 20 },
-                { header: 'Interaction Type', key: 'interaction_type', width: 15 },
-                { header: 'Reply Text', key: 'reply_text', width: 50 },
-                { header: 'Reply Tweet ID', key: 'reply_tweet_id', width: 20 },
-                { header: 'Created At', key: 'created_at', width: 20 }
-            ];
-            repliesSheet.addRows(repliers);
         }
 
+        writeRows(repliesSheet, replyCells, 'Reply')(repliers);
+        await workbook.commit();
+
+        return { likeCount, retweetCount, repliers, totalCount: seenUsers.size };
+    }
+
+    async extract(tweetUrl, options = {}) {
+        const { outputFile = null } = options;
+        const tweetId = this.extractTweetId(tweetUrl);
+
+        console.log('\n' + '='.repeat(70));
+        console.log('🚀 TWITTER DATA EXTRACTOR (Node.js)');
+        console.log('='.repeat(70));
+        console.log(`\n📌 Tweet ID: ${tweetId}`);
+        console.log('⏳ This may take a while depending on the number of interactions...');
+
+        console.log('\n' + '─'.repeat(70));
+        console.log('📊 RATE LIMITS INFO');
+        console.log('─'.repeat(70));
+        console.log('   • Likes:    25 requests / 15 minutes');
+        console.log('   • Retweets: 25 requests / 15 minutes');
+        console.log('   • Each request gets up to 100 users');
+        console.log('\n💡 Strategy: delays follow the x-rate-limit-remaining/reset headers');
+        console.log('✅ The script handles this automatically - just let it run!');
+        console.log('─'.repeat(70));
+
+        // Get all data
+        console.log('\n' + '='.repeat(70));
+        console.log('📥 EXTRACTING DATA...');
+        console.log('='.repeat(70));
+
         // Generate filename
         const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, 19).replace('T', '_');
         const filename = outputFile || `twitter_data_${tweetId}_${timestamp}.xlsx`;
 
-        // Write file
-        const buffer = await workbook.xlsx.writeBuffer();
-        writeFileSync(filename, buffer);
+        // Write to a temp file on local disk and move it into place when
+        // complete: the many small writes don't hit a synced or network
+        // folder, and an interrupted run never leaves a truncated workbook
+        const tempPath = join(tmpdir(), `twitter_data_${tweetId}_${process.pid}.xlsx`);
+        let result;
+        try {
+            result = await this.writeWorkbook(tempPath, tweetUrl, tweetId, options);
+            await moveFile(tempPath, filename);
+        } catch (error) {
+            await unlink(tempPath).catch(() => {});
+            throw error;
+        }
+
+        // The run is complete, so its page logs go: they hold full API
+        // payloads, and a later --resume would just re-export this run
+        for (const store of this.openStores.splice(0)) {
+            try {
+                store.remove();
+            } catch (error) {
+                console.log(`   ⚠️  Could not remove resume log ${store.path}: ${error.message}`);
+            }
+        }
+        const { likeCount, retweetCount, repliers, totalCount } = result;
 
         // Print summary
         console.log('\n' + '='.repeat(70));
@@ -648,21 +961,21 @@ class TwitterExtractor {
         console.log(`\n📁 File: ${filename}`);
         console.log('\n📊 SUMMARY:');
         console.log('   ' + '─'.repeat(60));
-        console.log(`   👥 Total unique users: ${allData.length}`);
-        console.log(`   ❤️  Likes:              ${likers.length}`);
-        console.log(`   🔄 Retweets:           ${retweeters.length}`);
+        console.log(`   👥 Total unique users: ${totalCount}`);
+        console.log(`   ❤️  Likes:              ${likeCount}`);
+        console.log(`   🔄 Retweets:           ${retweetCount}`);
         console.log(`   💬 Replies:            ${repliers.length} (with reply text)`);
         console.log('   ' + '─'.repeat(60));
 
         console.log('\n📋 EXCEL FILE CONTENTS:');
         console.log('   ' + '─'.repeat(60));
-        if (likers.length > 0) {
-            console.log(`   ✅ 'Likes' sheet:        ${likers.length} users`);
+        if (likeCount > 0) {
+            console.log(`   ✅ 'Likes' sheet:        ${likeCount} users`);
         } else {
             console.log('   ⚠️  \'Likes\' sheet:        Empty');
         }
-        if (retweeters.length > 0) {
-            console.log(`   ✅ 'Retweets' sheet:     ${retweeters.length} users`);
+        if (retweetCount > 0) {
+            console.log(`   ✅ 'Retweets' sheet:     ${retweetCount} users`);
         } else {
             console.log('   ⚠️  \'Retweets\' sheet:    Empty');
         }
@@ -671,10 +984,10 @@ class TwitterExtractor {
         } else {
             console.log('   ⚠️  \'Replies\' sheet:     Empty');
         }
-        console.log(`   ✅ 'All Interactions':  Combined data (${allData.length} total)`);
+        console.log(`   ✅ 'All Interactions':  Combined data (${totalCount} unique users)`);
         console.log('   ' + '─'.repeat(60));
 
-        if (allData.length > 0) {
+        if (totalCount > 0) {
             console.log('\n🎉 SUCCESS! Data extracted and saved to Excel file!');
         } else {
             console.log('\n⚠️  No data found. Check if tweet is public and has interactions.');
@@ -718,6 +1031,11 @@ async function main() {
         process.exit(1);
     }
 
+    // -v / --verbose: per-page progress and rate-limit pacing (same as LOG_LEVEL=debug)
+    if (args.includes('-v') || args.includes('--verbose')) {
+        logger.setLevel('debug');
+    }
+
     // Get tweet URL - filter out flags
     let tweetUrl = null;
     for (const arg of args) {
@@ -752,7 +1070,9 @@ async function main() {
         apiKey,
         apiSecret,
         accessToken,
-        accessTokenSecret
+        accessTokenSecret,
+        verboseDiagnostics: args.includes('--diagnose'),
+        resume: args.includes('--resume')
     });
 
     // Check for scraping flag in args (not process.argv to avoid npm config issues)
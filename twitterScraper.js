@@ -8,6 +8,8 @@
 
 import puppeteer from 'puppeteer';
 import { existsSync } from 'fs';
+import logger from './logger.js';
+import { extractTweetId } from './tweetId.js';
 
 class TwitterScraper {
     constructor(options = {}) {
@@ -17,10 +19,7 @@ class TwitterScraper {
     }
 
     extractTweetId(url) {
-        if (url.includes('/status/')) {
-            return url.split('/status/')[1].split('?')[0];
-        }
-        return url;
+        return extractTweetId(url);
     }
 
     async getRepliesViaScraping(tweetUrl, maxReplies = 500) {
@@ -779,9 +778,7 @@ class TwitterScraper {
             } else {
                 console.log(`   ❌ Error during scraping: ${error.name}: ${error.message}`);
                 console.log('   💡 Twitter may have changed their page structure or blocked the request');
-                if (error.stack) {
-                    console.log(`   📋 Error stack: ${error.stack.substring(0, 300)}...`);
-                }
+                logger.debug(() => `   📋 Error stack: ${error.stack}`);
             }
         } finally {
             if (browser) {
@@ -1111,9 +1108,7 @@ export async function getRepliesWithFallback(tweetUrl, apiReplies, tweetAgeDays,
             } else {
                 console.log(`   ❌ Scraping failed: ${error.name}: ${error.message}`);
                 console.log('   💡 Falling back to API results only');
-                if (error.stack) {
-                    console.log(`   📋 Error details: ${error.stack.substring(0, 200)}...`);
-                }
+                logger.debug(() => `   📋 Error details: ${error.stack}`);
             }
         }
     }